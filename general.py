@@ -1,18 +1,89 @@
-﻿from collections import Iterable
+﻿from collections import deque
+from collections.abc import Iterable
+from contextlib import contextmanager
 import numpy as np
-import sympy
 import pymel.core as pm
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
+
+try:
+    from numba import njit
+
+    @njit(cache=True, fastmath=True)
+    def _projectOntoLine(P, a, d, out):
+        """ Project each row of P onto the line
+        through a with direction d, writing into out. """
+        dd = d[0]*d[0] + d[1]*d[1] + d[2]*d[2]
+        for i in range(P.shape[0]):
+            t = ((P[i, 0] - a[0])*d[0] + (P[i, 1] - a[1])*d[1] \
+                + (P[i, 2] - a[2])*d[2]) / dd
+            out[i, 0] = a[0] + t*d[0]
+            out[i, 1] = a[1] + t*d[1]
+            out[i, 2] = a[2] + t*d[2]
+
+    @njit(cache=True, fastmath=True)
+    def _projectOntoPlane(P, a, n, out):
+        """ Project each row of P onto the plane
+        through a with normal n, writing into out. """
+        nn = n[0]*n[0] + n[1]*n[1] + n[2]*n[2]
+        for i in range(P.shape[0]):
+            t = ((a[0] - P[i, 0])*n[0] + (a[1] - P[i, 1])*n[1] \
+                + (a[2] - P[i, 2])*n[2]) / nn
+            out[i, 0] = P[i, 0] + t*n[0]
+            out[i, 1] = P[i, 1] + t*n[1]
+            out[i, 2] = P[i, 2] + t*n[2]
+except ImportError:
+    def _projectOntoLine(P, a, d, out):
+        """ Numpy fallback when numba is not available. """
+        t = ((P - a) @ d) / (d @ d)
+        out[:] = a + t[:, None] * d
+
+    def _projectOntoPlane(P, a, n, out):
+        """ Numpy fallback when numba is not available. """
+        t = ((a - P) @ n) / (n @ n)
+        out[:] = P + t[:, None] * n
+
+
+@contextmanager
+def _fastMaya():
+    """ Suspend viewport refresh, undo recording, parallel evaluation
+    and panel drawing while a routine issues many commands in a row.
+    Everything is restored on exit, even on error.
+     """
+    panels = cmds.getPanel(type="modelPanel") or []
+    # Panels the user isolated deliberately are left alone.
+    panels = [i for i in panels \
+        if not cmds.isolateSelect(i, q=True, state=True)]
+    evalMode = cmds.evaluationManager(q=True, mode=True)[0]
+    cmds.refresh(suspend=True)
+    cmds.undoInfo(stateWithoutFlush=False)
+    for i in panels:
+        cmds.isolateSelect(i, state=1)
+    cmds.evaluationManager(mode="off")
+    try:
+        yield
+    finally:
+        cmds.evaluationManager(mode=evalMode)
+        for i in panels:
+            cmds.isolateSelect(i, state=0)
+        cmds.undoInfo(stateWithoutFlush=True)
+        cmds.refresh(suspend=False)
 
 
 def getPosition(selection: str) -> list:
     """ Get the coordinates of an object or point.
+    Components like "pSphere1.vtx[317]" go through pointPosition,
+    everything else through xform. Pass component syntax directly
+    for vertex queries.
     >>> getPosition("pSphere1")
     >>> getPosition("pSphere1.vtx[317]")
     >>> [0.0, 0.0, 0.0]
      """
-    try:
+    name = str(selection)
+    if "." in name and "[" in name:
         position = pm.pointPosition(selection)
-    except:
+    else:
         position = pm.xform(selection, q=1, ws=1, rp=1)
     return position
 
@@ -33,10 +104,13 @@ def getFlattenList(*args):
     >>> return ['ab', 'bc', 'ef', 'gh', 'ij', 'jk']
      """
     result = []
-    for arg in args:
-        if not isinstance(arg, str) and isinstance(arg, Iterable):
-            for i in arg:
-                result.extend(getFlattenList(i))
+    stack = deque(args)
+    while stack:
+        arg = stack.popleft()
+        if isinstance(arg, str):
+            result.append(arg)
+        elif isinstance(arg, (list, tuple)) or isinstance(arg, Iterable):
+            stack.extendleft(reversed(list(arg)))
         else:
             result.append(arg)
     return result
@@ -44,11 +118,8 @@ def getFlattenList(*args):
 
 def getBoundingBoxPosition(vertexOrObject) -> list:
     boundingBox = pm.xform(vertexOrObject, q=True, bb=True, ws=True)
-    xMin, yMin, zMin, xMax, yMax, zMax = boundingBox
-    x = (xMin + xMax) / 2
-    y = (yMin + yMax) / 2
-    z = (zMin + zMax) / 2
-    return [x, y, z]
+    boundingBox = np.asarray(boundingBox, dtype=np.float64).reshape(2, 3)
+    return ((boundingBox[0] + boundingBox[1]) * 0.5).tolist()
 
 
 def getBoundingBoxSize(vertexOrObject) -> list:
@@ -72,34 +143,92 @@ def orientJoints(joints=[], primaryAxis='yzx', secondaryAxis='zup'):
     - "yup"
      """
     if joints:
-        allJoints = [pm.PyNode(i) for i in joints]
+        allJoints = cmds.ls(joints, long=True)
     else:
-        allJoints = pm.ls(sl=True)
-    endJoints = [i for i in allJoints if not i.getChildren()]
+        allJoints = cmds.ls(sl=True, long=True)
+    children = cmds.listRelatives(allJoints, c=True, type='joint', \
+        fullPath=True) or []
+    jointsWithChild = {i.rsplit("|", 1)[0] for i in children}
+    endJoints = [i for i in allJoints if i not in jointsWithChild]
     initJoint = allJoints[0]
-    pm.makeIdentity(allJoints, a=True, jo=True, n=0)
-    pm.joint(initJoint, 
-            e=True, # edit
-            oj=primaryAxis, # orientJoint
-            sao=secondaryAxis, # secondaryAxisOrient
-            ch=True, # children
-            zso=True, # zeroScaleOrient
-        )
-    for i in endJoints:
-        pm.joint(i, e=True, oj='none', ch=True, zso=True)
+    with _fastMaya():
+        cmds.makeIdentity(allJoints, a=True, jo=True, n=0)
+        pm.joint(initJoint,
+                e=True, # edit
+                oj=primaryAxis, # orientJoint
+                sao=secondaryAxis, # secondaryAxisOrient
+                ch=True, # children
+                zso=True, # zeroScaleOrient
+            )
+        if endJoints:
+            selected = cmds.ls(sl=True)
+            cmds.select(endJoints)
+            cmds.joint(e=True, oj='none', ch=True, zso=True)
+            if selected:
+                cmds.select(selected)
+            else:
+                cmds.select(cl=True)
+
+
+def _getKeyedPositions(name, startFrame, endFrame):
+    """ Return an (N, 3) array of translate values
+    when an un-parented object is driven by plain animCurves
+    with a key on exactly every frame of the range.
+    Anything else, such as keys off the integer frames or a channel
+    routed through a pairBlend or an anim layer, returns None
+    and must be evaluated frame by frame.
+     """
+    if cmds.listRelatives(name, p=True):
+        return None
+    frames = list(range(startFrame, endFrame + 1))
+    timeRange = (startFrame, endFrame)
+    channels = []
+    for attr in ("tx", "ty", "tz"):
+        plug = f"{name}.{attr}"
+        upstream = cmds.listConnections(plug, s=True, d=False) or []
+        if len(upstream) != 1:
+            return None
+        if not cmds.nodeType(upstream[0]).startswith("animCurve"):
+            return None
+        times = cmds.keyframe(plug, q=True, tc=True, t=timeRange)
+        if times != frames:
+            return None
+        channels.append(cmds.keyframe(plug, q=True, vc=True, t=timeRange))
+    return np.column_stack(channels)
 
 
 def createCurvePassingKeyedUp(startFrame, endFrame, objects=[]):
+    """ Walk the frames once, and in each frame
+    gather all object positions through the API at once.
+    The scene is evaluated per frame, not per object per frame.
+    Objects keyed on every frame are sampled straight from their
+    animation curves, without advancing scene time at all.
+     """
     sel = objects if objects else pm.ls(sl=True)
-    curves = []
+    frameCount = endFrame - startFrame + 1
+    positions = []
+    needEvaluation = []
     for i in sel:
-        positions = []
-        for frame in range(startFrame, endFrame + 1):
-            pm.currentTime(frame)
-            pos = getPosition(i)
+        keyedPositions = _getKeyedPositions(str(i), startFrame, endFrame)
+        if keyedPositions is None:
+            selectionList = om.MSelectionList()
+            selectionList.add(str(i))
+            fn = om.MFnTransform(selectionList.getDagPath(0))
+            pos = np.empty((frameCount, 3), dtype=np.float64)
+            needEvaluation.append((fn, pos))
             positions.append(pos)
-        cuv = pm.curve(p=positions, d=3)
-        curves.append(cuv)
+        else:
+            positions.append(keyedPositions)
+    with _fastMaya():
+        for idx, frame in enumerate(range(startFrame, endFrame + 1)):
+            if not needEvaluation:
+                break
+            time = om.MTime(frame, om.MTime.uiUnit())
+            oma.MAnimControl.setCurrentTime(time)
+            for fn, pos in needEvaluation:
+                point = fn.rotatePivot(om.MSpace.kWorld)
+                pos[idx] = (point.x, point.y, point.z)
+        curves = [pm.curve(p=pos.tolist(), d=3) for pos in positions]
     return curves
 
 
@@ -122,8 +251,19 @@ def createClosedCurve(objects=[]) -> str:
     positions = [getPosition(i) for i in sel]
     circle = pm.circle(nr=(0, 1, 0), ch=False, s=len(sel))
     circle = circle[0]
-    for i, pos in enumerate(positions):
-        pm.move(f"{circle}.cv[{i}]", pos, ws=True)
+    try:
+        selectionList = om.MSelectionList()
+        selectionList.add(circle.getShape().name())
+        curveFn = om.MFnNurbsCurve(selectionList.getDagPath(0))
+        points = curveFn.cvPositions(om.MSpace.kWorld)
+        for i in range(len(points)):
+            points[i] = om.MPoint(*positions[i % len(positions)])
+        curveFn.setCVPositions(points, om.MSpace.kWorld)
+        curveFn.updateCurve()
+    except RuntimeError:
+        shape = circle.getShape()
+        for i, pos in enumerate(positions):
+            pm.move(shape.cv[i], pos, ws=True)
     return circle
 
 
@@ -134,36 +274,39 @@ def createCurveAimingPoint(objects=[]) -> str:
      """
     sel = objects if objects else pm.ls(sl=True, fl=True)
     positions = [getPosition(i) for i in [sel[0], sel[-1]]]
-    simpleCurve = pm.curve(p=positions, d=1)
-    locators = []
-    for i in positions:
-        locator = pm.spaceLocator()
-        pm.move(locator, i)
-        locators.append(locator)
-    startLocator, endLocator = locators
-    pm.aimConstraint(endLocator, startLocator)
-    pm.delete(startLocator, cn=True)
-    makeSameAsParentPivot(simpleCurve, startLocator)
-    pm.rebuildCurve(simpleCurve, d=3, ch=0, s=3, rpo=1, end=1, kr=0, kt=0)
-    pm.delete(locators)
+    with _fastMaya():
+        simpleCurve = pm.curve(p=positions, d=1)
+        locators = []
+        for i in positions:
+            locator = pm.spaceLocator()
+            pm.move(locator, i)
+            locators.append(locator)
+        startLocator, endLocator = locators
+        pm.aimConstraint(endLocator, startLocator)
+        pm.delete(startLocator, cn=True)
+        makeSameAsParentPivot(simpleCurve, startLocator)
+        pm.rebuildCurve(simpleCurve, d=3, ch=0, s=3, rpo=1, end=1, kr=0, kt=0)
+        pm.delete(locators)
     return simpleCurve
 
 
 def createCurvesNormalDirection(vertex=[]) -> list:
+    """ Create a curve along the normal of each vertex.
+    The curve is built directly from the vertex position
+    and its normal, without locators or constraints.
+     """
     sel = vertex if vertex else pm.ls(sl=True, fl=True)
     result = []
     for vtx in sel:
-        vertexPosition = pm.pointPosition(vtx)
+        vertexPosition = np.asarray(pm.pointPosition(vtx))
         normalVector = pm.polyNormalPerVertex(vtx, q=True, normalXYZ=True)
-        normalVector = normalVector[0:3]
-        locators = []
-        for pos in [(0, 0, 0), normalVector]:
-            locator = pm.spaceLocator()
-            locators.append(locator)
-            pm.move(locator, pos)
-        unitCurve = createCurveAimingPoint(locators)
-        pm.move(unitCurve, vertexPosition)
-        pm.delete(locators)
+        normalVector = np.asarray(normalVector[0:3])
+        endPosition = vertexPosition + normalVector
+        positions = [vertexPosition.tolist(), endPosition.tolist()]
+        unitCurve = pm.curve(p=positions, d=1)
+        pm.xform(unitCurve, ws=True, rp=vertexPosition.tolist(), \
+            sp=vertexPosition.tolist())
+        pm.rebuildCurve(unitCurve, d=3, ch=0, s=3, rpo=1, end=1, kr=0, kt=0)
         result.append(unitCurve)
     return result
 
@@ -176,19 +319,32 @@ def selectObjectOnly() -> list:
     return result
 
 
+def _classifyTransforms(nodes: list) -> tuple:
+    """ Classify transform nodes with two batched queries.
+    Return the node type by name and the set of nodes owning a shape,
+    instead of querying objectType and listRelatives per node.
+    """
+    if not nodes:
+        return {}, set()
+    typed = cmds.ls(nodes, showType=True, long=True)
+    typeMap = dict(zip(typed[0::2], typed[1::2]))
+    shapes = cmds.listRelatives(nodes, s=True, fullPath=True) or []
+    shapeParents = cmds.listRelatives(shapes, p=True, fullPath=True) or []
+    return typeMap, set(shapeParents)
+
+
 def selectGroupOnly() -> list:
-    """ If there is no shape and the type is not 
-    'joint', 'ikEffector', 'ikHandle' and 'Constraint', 
-    it is most likely a group. 
+    """ If there is no shape and the type is not
+    'joint', 'ikEffector', 'ikHandle' and 'Constraint',
+    it is most likely a group.
     """
-    transformNodes = pm.ls(sl=True, dag=True, type=['transform'])
+    transformNodes = cmds.ls(sl=True, dag=True, type='transform', long=True)
+    typeMap, shapedNodes = _classifyTransforms(transformNodes)
     result = []
     for i in transformNodes:
-        iType = pm.objectType(i)
-        isShape = pm.listRelatives(i, s=True)
-        isAnotherType = iType in ['joint', 'ikEffector', 'ikHandle',]
-        isConstraint = 'Constraint' in iType
-        if not (isShape or isAnotherType or isConstraint):
+        isAnotherType = typeMap[i] in ['joint', 'ikEffector', 'ikHandle',]
+        isConstraint = 'Constraint' in typeMap[i]
+        if not (i in shapedNodes or isAnotherType or isConstraint):
             result.append(i)
         else:
             continue
@@ -197,18 +353,17 @@ def selectGroupOnly() -> list:
 
 
 def selectConstraintOnly() -> list:
-    """ If there is no shape and the type is not 
-    'joint', 'ikEffector', 'ikHandle', and <not> 'Constraint', 
+    """ If there is no shape and the type is not
+    'joint', 'ikEffector', 'ikHandle', and <not> 'Constraint',
     it is most likely a Constraints.
     """
-    transformNodes = pm.ls(sl=True, dag=True, type=['transform'])
+    transformNodes = cmds.ls(sl=True, dag=True, type='transform', long=True)
+    typeMap, shapedNodes = _classifyTransforms(transformNodes)
     result = []
     for i in transformNodes:
-        iType = pm.objectType(i)
-        isShape = pm.listRelatives(i, s=True)
-        isAnotherType = iType in ['joint', 'ikEffector', 'ikHandle',]
-        isConstraint = 'Constraint' in iType
-        if not (isShape or isAnotherType or not isConstraint):
+        isAnotherType = typeMap[i] in ['joint', 'ikEffector', 'ikHandle',]
+        isConstraint = 'Constraint' in typeMap[i]
+        if not (i in shapedNodes or isAnotherType or not isConstraint):
             result.append(i)
         else:
             continue
@@ -217,14 +372,7 @@ def selectConstraintOnly() -> list:
 
 
 def selectJointOnly() -> list:
-    transformNodes = pm.ls(sl=True, dag=True, type=['transform'])
-    result = []
-    for i in transformNodes:
-        iType = pm.objectType(i)
-        if iType == 'joint':
-            result.append(i)
-        else:
-            continue
+    result = cmds.ls(sl=True, dag=True, type='joint', long=True)
     pm.select(result)
     return result
 
@@ -313,13 +461,23 @@ class RigGroups:
     def createRigGroups(self, assetName=""):
         if assetName:
             self.groupNames[assetName] = self.groupNames.pop("assetName")
-        for parents, children in self.groupNames.items():
-            if not pm.objExists(parents):
-                pm.group(em=True, n=parents)
-            for child in children:
-                if not pm.objExists(child):
-                    pm.group(em=True, n=child)
-                pm.parent(child, parents)
+        allNodes = set(self.groupNames)
+        for children in self.groupNames.values():
+            allNodes.update(children)
+        existing = set(cmds.ls(list(allNodes)))
+        for node in allNodes:
+            if node not in existing:
+                pm.group(em=True, n=node)
+        edges = [(child, parents) \
+            for parents, children in self.groupNames.items() \
+            for child in children]
+        parentMap = {child: cmds.listRelatives(child, p=True) \
+            for child, parents in edges}
+        for child, parents in edges:
+            currentParent = parentMap[child]
+            if currentParent and currentParent[0] == parents:
+                continue
+            pm.parent(child, parents)
 
 
 class AlignObjects:
@@ -343,18 +501,22 @@ class AlignObjects:
             pm.warning("Select 4 or more objects.")
             return
         myParents = {i: i.getParent() for i in sel}
-        self.unParent(myParents)
-        mainDots = sel[:3]
-        subDots = sel[3:]
-        mainDotsPosition = [pm.xform(i, q=1, t=1, ws=1) for i in mainDots]
-        normalVector = self.getFaceNormalVector(mainDotsPosition)
-        planePoint = mainDotsPosition[0]
-        for i in subDots:
-            pointOfLine = pm.xform(i, q=True, t=True, ws=True)
-            intersectionPoint = self.getIntersectionPoint(normalVector, \
-                                planePoint, normalVector, pointOfLine)
-            pm.move(i, intersectionPoint)
-        self.reParent(myParents)
+        with _fastMaya():
+            self.unParent(myParents)
+            mainDots = sel[:3]
+            subDots = sel[3:]
+            mainDotsPosition = [pm.xform(i, q=1, t=1, ws=1) for i in mainDots]
+            normalVector = self.getFaceNormalVector(mainDotsPosition)
+            subDotsPosition = np.array([pm.xform(i, q=1, t=1, ws=1) \
+                                for i in subDots], dtype=np.float64)
+            normal = np.asarray(normalVector, dtype=np.float64)
+            planePoint = np.asarray(mainDotsPosition[0], dtype=np.float64)
+            intersectionPoints = np.empty_like(subDotsPosition)
+            _projectOntoPlane(subDotsPosition, planePoint, normal, \
+                intersectionPoints)
+            for i, pos in zip(subDots, intersectionPoints.tolist()):
+                pm.move(i, pos)
+            self.reParent(myParents)
 
 
     def unParent(self, myParents: dict) -> None:
@@ -374,14 +536,13 @@ class AlignObjects:
 
 
     def getFaceNormalVector(self, threePointsPosition=[]):
-        """ Given three points, 
-        create a face and return the normal vector of the face.
+        """ Given three points,
+        return the normal vector of the face they form.
         """
-        face = pm.polyCreateFacet(p=threePointsPosition)
-        info = pm.polyInfo(face, fn=True)
-        stripInfo = info[0].split(":")[-1].strip()
-        normalVector = [float(i) for i in stripInfo.split(" ")]
-        return normalVector
+        p0, p1, p2 = [np.asarray(i) for i in threePointsPosition]
+        normalVector = np.cross(p1 - p0, p2 - p0)
+        normalVector = normalVector / np.linalg.norm(normalVector)
+        return normalVector.tolist()
 
 
     def getIntersectionPoint(self, normalOfPlane: list, pointOnPlane: list, \
@@ -408,11 +569,11 @@ class AlignCurvePoints:
 
     def alignCurveStraight(self):
         """ Arrange the points in a straight line.
-        Use the equation of a straight line in space 
-        to make a curved line a straight line.
-        1. Create an equation
-        2. Check the condition.
-        3. Make a straight line.
+        Project every point onto the line
+        passing through the first and last points.
+        1. Get the line passing through both end points.
+        2. Project all points onto the line at once.
+        3. Move each point to the projected position.
         """
         originalCurveVertex = pm.ls(sl=True, fl=True)
         if len(originalCurveVertex) < 2:
@@ -420,27 +581,42 @@ class AlignCurvePoints:
             return
         firstPoint = originalCurveVertex[0]
         lastPoint = originalCurveVertex[-1]
-        solutions = self.calculateEquation(firstPoint, lastPoint)
+        startPosition = np.asarray(firstPoint.getPosition(space="world"), \
+                            dtype=np.float64)
+        endPosition = np.asarray(lastPoint.getPosition(space="world"), \
+                            dtype=np.float64)
+        direction = endPosition - startPosition
         copiedCurve = self.copyCurve(originalCurveVertex)
-        copiedCurveVertex = pm.ls(f"{copiedCurve}.cv[*]", fl=True)
-        for i in copiedCurveVertex:
-            pointPosition = i.getPosition(space="world")
-            finalPosition = self.getFinalPosition(pointPosition, solutions)
-            pm.move(i, finalPosition)
+        copiedCurveVertex = pm.ls(copiedCurve.getShape().cv, fl=True)
+        pointPositions = np.asarray([i.getPosition(space="world") \
+                            for i in copiedCurveVertex], dtype=np.float64)
+        finalPositions = np.empty_like(pointPositions)
+        _projectOntoLine(pointPositions, startPosition, direction, \
+            finalPositions)
+        finalPositions = np.round(finalPositions, 4)
+        for i, pos in zip(copiedCurveVertex, finalPositions.tolist()):
+            pm.move(i, pos)
 
 
     def copyCurve(self, vertices: list):
-        originalCurve = pm.ls(vertices, o=True)
+        """ All vertices share one owner,
+        so only the first vertex is asked for it. """
+        firstVertex = vertices[0]
+        if hasattr(firstVertex, "node"):
+            originalCurve = firstVertex.node()
+        else:
+            originalCurve = pm.PyNode(str(firstVertex).split(".")[0])
         copiedCurve = pm.duplicate(originalCurve, rr=True)
         copiedCurve = copiedCurve[0]
         return copiedCurve
 
 
     def calculateEquation(self, firstPoint, lastPoint):
-        """ Create an equation for a straight line 
-        passing through two points. Calculate the positions of other points 
-        not included in the straight line. 
+        """ Create an equation for a straight line
+        passing through two points. Calculate the positions of other points
+        not included in the straight line.
          """
+        import sympy
         # Equation
         x1, y1, z1 = firstPoint.getPosition(space="world")
         x2, y2, z2 = lastPoint.getPosition(space="world")
@@ -472,6 +648,7 @@ class AlignCurvePoints:
 
 
     def getFinalPosition(self, pointPosition, solutions):
+        import sympy
         idx, highestGap, variables, expr, equation = solutions
         value = pointPosition[idx]
         fx = [i.subs(highestGap, value) for i in expr]
@@ -482,185 +659,185 @@ class AlignCurvePoints:
 
 
 class Controllers:
-    def __init__(self):
-        self.controllerShapes = {
-            "arrow": [
-                (0, 0, 8), (8, 0, 4), (4, 0, 4), (4, 0, -8), 
-                (-4, 0, -8), (-4, 0, 4), (-8, 0, 4), (0, 0, 8)
-                ], 
-            "arrow2": [
-                (0, 3, 12), (12, 3, 6), (6, 3, 6), (6, 3, -12), 
-                (-6, 3, -12), (-6, 3, 6), (-12, 3, 6), (0, 3, 12), 
-                (0, -3, 12), (12, -3, 6), (6, -3, 6), (6, -3, -12), 
-                (-6, -3, -12), (-6, -3, 6), (-12, -3, 6), (0, -3, 12), 
-                (12, -3, 6), (12, 3, 6), (6, 3, 6), (6, 3, -12), 
-                (6, -3, -12), (-6, -3, -12), (-6, 3, -12), (-6, 3, 6), 
-                (-12, 3, 6), (-12, -3, 6)
-                ], 
-            "arrow3": [
-                (14, 0, 0), (10, 0, -10), (0, 0, -14), (-10, 0, -10), 
-                (-14, 0, 0), (-10, 0, 10), (0, 0, 14), (10, 0, 10), 
-                (14, 0, 0), (10, 0, 4), (14, 0, 6), (14, 0, 0)
-                ], 
-            "arrow4": [
-                (0, 0, -23.1), (-6.3, 0, -16.8), (-4.2, 0, -16.8), 
-                (-4.2, 0, -12.6), (-10.5, 0, -10.5), (-12.6, 0, -4.2), 
-                (-16.8, 0, -4.2), (-16.8, 0, -6.3), (-23.1, 0, 0), 
-                (-16.8, 0, 6.3), (-16.8, 0, 4.2), (-12.6, 0, 4.2), 
-                (-10.5, 0, 10.5), (-4.2, 0, 12.6), (-4.2, 0, 16.8), 
-                (-6.3, 0, 16.8), (0, 0, 23.1), (6.3, 0, 16.8), 
-                (4.2, 0, 16.8), (4.2, 0, 12.6), (10.5, 0, 10.5), 
-                (12.6, 0, 4.2), (16.8, 0, 4.2), (16.8, 0, 6.3), 
-                (23.1, 0, 0), (16.8, 0, -6.3), (16.8, 0, -4.2), 
-                (12.6, 0, -4.2), (10.5, 0, -10.5), (4.2, 0, -12.6), 
-                (4.2, 0, -16.8), (6.3, 0, -16.8), (0, 0, -23.1)
-                ], 
-            "arrow5": [
-                (-8, 0, -4), (8, 0, -4), (8, 0, -8), (16, 0, 0), 
-                (8, 0, 8), (8, 0, 4), (-8, 0, 4), (-8, 0, 8), 
-                (-16, 0, 0), (-8, 0, -8), (-8, 0, -4)
-                ], 
-            "arrow6": [
-                (-0, 0, -12.6), (-0, 4, -13), (-0, 2, -10), 
-                (-0, 0, -12.6), (-0, 2, -12), (-0, 6, -10), 
-                (-0, 10, -6), (0, 12, 0), (0, 10, 6), (0, 6, 10), 
-                (0, 2, 12), (0, 0, 12.6), (0, 2, 10), (0, 4, 13), 
-                (0, 0, 12.6)
-                ], 
-            "car": [
-                (81, 70, 119), (89, 56, 251), (89, -12, 251), 
-                (89, -12, 117), (89, -12, -117), (89, -12, -229), 
-                (81, 70, -229), (81, 70, -159), (69, 111, -105), 
-                (69, 111, 63), (81, 70, 119), (-81, 70, 119), 
-                (-89, 56, 251), (-89, -12, 251), (-89, -12, 117), 
-                (-89, -12, -117), (-89, -12, -229), (-81, 70, -229), 
-                (-81, 70, -159), (-69, 111, -105), (69, 111, -105), 
-                (81, 70, -159), (-81, 70, -159), (-81, 70, -229), 
-                (81, 70, -229), (89, -12, -229), (-89, -12, -229), 
-                (-89, -12, -117), (-89, -12, 117), (-89, -12, 251), 
-                (89, -12, 251), (89, 56, 251), (-89, 56, 251), 
-                (-81, 70, 119), (-69, 111, 63), (-69, 111, -105), 
-                (69, 111, -105), (69, 111, 63), (-69, 111, 63)
-                ], 
-            "car2": [
-                (165, 0, -195), (0, 0, -276), (-165, 0, -195), (-97, 0, -0), 
-                (-165, -0, 195), (-0, -0, 276), (165, -0, 195), (97, -0, 0), 
-                (165, 0, -195)
-                ], 
-            "car3": [
-                (212, 0, -212), (0, 0, -300), (-212, 0, -212), (-300, 0, 0), 
-                (-212, 0, 212), (0, 0, 300), (212, 0, 212), (300, 0, 0), 
-                (212, 0, -212)
-                ], 
-            "circle": [
-                (0, 0, -15), (-10, 0, -10), (-15, 0, 0), 
-                (-10, 0, 10), (0, 0, 15), (10, 0, 10), 
-                (15, 0, 0), (10, 0, -10), (0, 0, -15)
-                ], 
-            "cone": [
-                (0, 10, 0), (-4.35, 0, 0), (4.35, 0, 0), (0, 10, 0), 
-                (0, 0, 5), (-4.35, 0, 0), (4.35, 0, 0), (0, 0, 5)
-                ], 
-            "cone2": [
-                (-5, 0, 0), (0, 0, 5), (5, 0, 0), (0, 0, -5), 
-                (0, 10, 0), (-5, 0, 0), (0, 10, 0), (0, 0, 5), 
-                (5, 0, 0), (0, 0, -5), (0, 0, -5), (-5, 0, 0), 
-                (0, 0, 5), (5, 0, 0), (0, 10, 0)
-                ], 
-            "cube": [
-                (-5, 5, -5), (-5, 5, 5), (5, 5, 5), (5, 5, -5), 
-                (-5, 5, -5), (-5, -5, -5), (-5, -5, 5), (5, -5, 5), 
-                (5, -5, -5), (-5, -5, -5), (-5, -5, 5), (-5, 5, 5), 
-                (5, 5, 5), (5, -5, 5), (5, -5, -5), (5, 5, -5)
-                ], 
-            "cross": [
-                (-1, 5, 0), (1, 5, 0), (1, 1, 0), (5, 1, 0), 
-                (5, -1, 0), (1, -1, 0), (1, -5, 0), (-1, -5, 0), 
-                (-1, -1, 0), (-5, -1, 0), (-5, 1, 0), (-1, 1, 0), 
-                (-1, 5, 0)
-                ], 
-            "cylinder": [
-                (-7, 7, 0), (-5, 7, 5), (0, 7, 7), (5, 7, 5), (7, 7, 0), 
-                (5, 7, -5), (0, 7, -7), (0, 7, 7), (0, -7, 7), (-5, -7, 5), 
-                (-7, -7, 0), (-5, -7, -5), (0, -7, -7), (5, -7, -5), 
-                (7, -7, 0), (5, -7, 5), (0, -7, 7), (0, -7, -7), 
-                (0, 7, -7), (-5, 7, -5), (-7, 7, 0), (7, 7, 0), 
-                (7, -7, 0), (-7, -7, 0), (-7, 7, 0)
-                ], 
-            "foot": [
-                (-4, 0, -4), (-4, 0, -7), (-3, 0, -11), (-1, 0, -12), 
-                (0, 0, -12), (1, 0, -12), (3, 0, -11), (4, 0, -7), 
-                (4, 0, -4), (-4, 0, -4), (-5, 0, 1), (-5, 0, 6), 
-                (-4, 0, 12), (-2, 0, 15), (0, 0, 15.5), (2, 0, 15), 
-                (4, 0, 12), (5, 0, 6), (5, 0, 1), (4, 0, -4), (-4, 0, -4), 
-                (4, 0, -4)
-                ], 
-            "foot2": [
-                (-6, 12, -14), (-6, 12, 6), (6, 12, 6), (6, 12, -14), 
-                (-6, 12, -14), (-6, 0, -14), (-6, 0, 18), (6, 0, 18), 
-                (6, 0, -14), (-6, 0, -14), (-6, 0, 18), (-6, 12, 6), 
-                (6, 12, 6), (6, 0, 18), (6, 0, -14), (6, 12, -14)
-                ], 
-            "hat": [
-                (14, 9, 0), (0, 15, 0), (-14, 9, 0), (-7, -5, 0), 
-                (-16, -7, 0), (0, -7, 0), (16, -7, 0), (7, -5, 0), 
-                (14, 9, 0)
-                ], 
-            "head": [
-                (13, 15, -11), (0, 25, -15), (-13, 15, -11), (-14, 6, 0), 
-                (-13, 15, 11), (0, 25, 15), (13, 15, 11), (14, 6, 0), 
-                (13, 15, -11)
-                ], 
-            "hoof": [
-                (-6, 0, -5), (-6.5, 0, -1), (-6, 0, 3), (-5.2, 0, 5.5), 
-                (-3, 0, 7.5), (0, 0, 8.2), (3, 0, 7.5), (5.2, 0, 5.5), 
-                (6, 0, 3), (6.5, 0, -1), (6, 0, -5), (4, 0, -5), 
-                (4.5, 0, -1), (4, 0, 3), (3.5, 0, 4.5), (2, 0, 6), 
-                (0, 0, 6.5), (-2, 0, 6), (-3.5, 0, 4.5), (-4, 0, 3), 
-                (-4.5, 0, -1), (-4, 0, -5), (-6, 0, -5), (-5.5, 0, -6.5), 
-                (5.5, 0, -6.5), (4.5, 0, -10), (2.2, 0, -12.2), 
-                (0, 0, -12.2), (-2.2, 0, -12.2), (-4.5, 0, -10), 
-                (-5.5, 0, -6.5)
-                ], 
-            "hoof2": [
-                (6, 6, -12), (0, 8, -12), (-6, 6, -12), (-8, 3, -13), 
-                (-8, 0, -12), (-7, 0, -10), (-8, 0, -6), (-9, 0, -1), 
-                (-8, 0, 4), (-5, 0, 9), (0, 0, 10), (5, 0, 9), (8, 0, 4), 
-                (9, 0, -1), (8, 0, -6), (7, 0, -10), (8, 0, -12), 
-                (8, 3, -13), (6, 6, -12)
-                ], 
-            "pipe": [
-                (0, 7, 7), (0, -7, 7), (4.9, -7, 4.9), (7, -7, 0), 
-                (7, 7, 0), (4.9, 7, -4.9), (0, 7, -7), (0, -7, -7), 
-                (-4.9, -7, -4.9), (-7, -7, 0), (-7, 7, 0), (-4.9, 7, 4.9), 
-                (0, 7, 7), (4.9, 7, 4.9), (7, 7, 0), (7, -7, 0), 
-                (4.9, -7, -4.9), (0, -7, -7), (0, 7, -7), (-4.9, 7, -4.9), 
-                (-7, 7, 0), (-7, -7, 0), (-4.9, -7, 4.9), (0, -7, 7)
-                ], 
-            "pointer": [
-                (0, 8, 4), (-2.8, 8, 2.8), (-4, 8, 0), (-2.8, 8, -2.8), 
-                (0, 8, -4), (2.8, 8, -2.8), (4, 8, -0), (2.8, 8, 2.8), 
-                (0, 8, 4), (0, 8, -0), (0, 0, -0)
-                ], 
-            "scapula": [
-                (2, 10, -11), (0, 0, -11), (-2, 10, -11), (-3, 18, 0), 
-                (-2, 10, 11), (0, 0, 11), (2, 10, 11), (3, 18, 0), 
-                (2, 10, -11)
-                ], 
-            "sphere": [
-                (0, 5, 0), (0, 3.5, 3.5), (0, 0, 5), (0, -3.5, 3.5), 
-                (0, -5, 0), (0, -3.5, -3.5), (0, 0, -5), (0, 3.5, -3.5), 
-                (0, 5, 0), (-3.5, 3.5, 0), (-5, 0, 0), (-3.5, 0, 3.5), 
-                (0, 0, 5), (3.5, 0, 3.5), (5, 0, 0), (3.5, 0, -3.5), 
-                (0, 0, -5), (-3.5, 0, -3.5), (-5, 0, 0), (-3.5, -3.5, 0), 
-                (0, -5, 0), (3.5, -3.5, 0), (5, 0, 0), (3.5, 3.5, 0), 
-                (0, 5, 0)
-                ], 
-            "square": [
-                (25, 0, 25), (25, 0, -25), (-25, 0, -25), 
-                (-25, 0, 25), (25, 0, 25)
-                ], 
-            }
+    controllerShapes = {
+        "arrow": (
+            (0, 0, 8), (8, 0, 4), (4, 0, 4), (4, 0, -8), 
+            (-4, 0, -8), (-4, 0, 4), (-8, 0, 4), (0, 0, 8)
+            ), 
+        "arrow2": (
+            (0, 3, 12), (12, 3, 6), (6, 3, 6), (6, 3, -12), 
+            (-6, 3, -12), (-6, 3, 6), (-12, 3, 6), (0, 3, 12), 
+            (0, -3, 12), (12, -3, 6), (6, -3, 6), (6, -3, -12), 
+            (-6, -3, -12), (-6, -3, 6), (-12, -3, 6), (0, -3, 12), 
+            (12, -3, 6), (12, 3, 6), (6, 3, 6), (6, 3, -12), 
+            (6, -3, -12), (-6, -3, -12), (-6, 3, -12), (-6, 3, 6), 
+            (-12, 3, 6), (-12, -3, 6)
+            ), 
+        "arrow3": (
+            (14, 0, 0), (10, 0, -10), (0, 0, -14), (-10, 0, -10), 
+            (-14, 0, 0), (-10, 0, 10), (0, 0, 14), (10, 0, 10), 
+            (14, 0, 0), (10, 0, 4), (14, 0, 6), (14, 0, 0)
+            ), 
+        "arrow4": (
+            (0, 0, -23.1), (-6.3, 0, -16.8), (-4.2, 0, -16.8), 
+            (-4.2, 0, -12.6), (-10.5, 0, -10.5), (-12.6, 0, -4.2), 
+            (-16.8, 0, -4.2), (-16.8, 0, -6.3), (-23.1, 0, 0), 
+            (-16.8, 0, 6.3), (-16.8, 0, 4.2), (-12.6, 0, 4.2), 
+            (-10.5, 0, 10.5), (-4.2, 0, 12.6), (-4.2, 0, 16.8), 
+            (-6.3, 0, 16.8), (0, 0, 23.1), (6.3, 0, 16.8), 
+            (4.2, 0, 16.8), (4.2, 0, 12.6), (10.5, 0, 10.5), 
+            (12.6, 0, 4.2), (16.8, 0, 4.2), (16.8, 0, 6.3), 
+            (23.1, 0, 0), (16.8, 0, -6.3), (16.8, 0, -4.2), 
+            (12.6, 0, -4.2), (10.5, 0, -10.5), (4.2, 0, -12.6), 
+            (4.2, 0, -16.8), (6.3, 0, -16.8), (0, 0, -23.1)
+            ), 
+        "arrow5": (
+            (-8, 0, -4), (8, 0, -4), (8, 0, -8), (16, 0, 0), 
+            (8, 0, 8), (8, 0, 4), (-8, 0, 4), (-8, 0, 8), 
+            (-16, 0, 0), (-8, 0, -8), (-8, 0, -4)
+            ), 
+        "arrow6": (
+            (-0, 0, -12.6), (-0, 4, -13), (-0, 2, -10), 
+            (-0, 0, -12.6), (-0, 2, -12), (-0, 6, -10), 
+            (-0, 10, -6), (0, 12, 0), (0, 10, 6), (0, 6, 10), 
+            (0, 2, 12), (0, 0, 12.6), (0, 2, 10), (0, 4, 13), 
+            (0, 0, 12.6)
+            ), 
+        "car": (
+            (81, 70, 119), (89, 56, 251), (89, -12, 251), 
+            (89, -12, 117), (89, -12, -117), (89, -12, -229), 
+            (81, 70, -229), (81, 70, -159), (69, 111, -105), 
+            (69, 111, 63), (81, 70, 119), (-81, 70, 119), 
+            (-89, 56, 251), (-89, -12, 251), (-89, -12, 117), 
+            (-89, -12, -117), (-89, -12, -229), (-81, 70, -229), 
+            (-81, 70, -159), (-69, 111, -105), (69, 111, -105), 
+            (81, 70, -159), (-81, 70, -159), (-81, 70, -229), 
+            (81, 70, -229), (89, -12, -229), (-89, -12, -229), 
+            (-89, -12, -117), (-89, -12, 117), (-89, -12, 251), 
+            (89, -12, 251), (89, 56, 251), (-89, 56, 251), 
+            (-81, 70, 119), (-69, 111, 63), (-69, 111, -105), 
+            (69, 111, -105), (69, 111, 63), (-69, 111, 63)
+            ), 
+        "car2": (
+            (165, 0, -195), (0, 0, -276), (-165, 0, -195), (-97, 0, -0), 
+            (-165, -0, 195), (-0, -0, 276), (165, -0, 195), (97, -0, 0), 
+            (165, 0, -195)
+            ), 
+        "car3": (
+            (212, 0, -212), (0, 0, -300), (-212, 0, -212), (-300, 0, 0), 
+            (-212, 0, 212), (0, 0, 300), (212, 0, 212), (300, 0, 0), 
+            (212, 0, -212)
+            ), 
+        "circle": (
+            (0, 0, -15), (-10, 0, -10), (-15, 0, 0), 
+            (-10, 0, 10), (0, 0, 15), (10, 0, 10), 
+            (15, 0, 0), (10, 0, -10), (0, 0, -15)
+            ), 
+        "cone": (
+            (0, 10, 0), (-4.35, 0, 0), (4.35, 0, 0), (0, 10, 0), 
+            (0, 0, 5), (-4.35, 0, 0), (4.35, 0, 0), (0, 0, 5)
+            ), 
+        "cone2": (
+            (-5, 0, 0), (0, 0, 5), (5, 0, 0), (0, 0, -5), 
+            (0, 10, 0), (-5, 0, 0), (0, 10, 0), (0, 0, 5), 
+            (5, 0, 0), (0, 0, -5), (0, 0, -5), (-5, 0, 0), 
+            (0, 0, 5), (5, 0, 0), (0, 10, 0)
+            ), 
+        "cube": (
+            (-5, 5, -5), (-5, 5, 5), (5, 5, 5), (5, 5, -5), 
+            (-5, 5, -5), (-5, -5, -5), (-5, -5, 5), (5, -5, 5), 
+            (5, -5, -5), (-5, -5, -5), (-5, -5, 5), (-5, 5, 5), 
+            (5, 5, 5), (5, -5, 5), (5, -5, -5), (5, 5, -5)
+            ), 
+        "cross": (
+            (-1, 5, 0), (1, 5, 0), (1, 1, 0), (5, 1, 0), 
+            (5, -1, 0), (1, -1, 0), (1, -5, 0), (-1, -5, 0), 
+            (-1, -1, 0), (-5, -1, 0), (-5, 1, 0), (-1, 1, 0), 
+            (-1, 5, 0)
+            ), 
+        "cylinder": (
+            (-7, 7, 0), (-5, 7, 5), (0, 7, 7), (5, 7, 5), (7, 7, 0), 
+            (5, 7, -5), (0, 7, -7), (0, 7, 7), (0, -7, 7), (-5, -7, 5), 
+            (-7, -7, 0), (-5, -7, -5), (0, -7, -7), (5, -7, -5), 
+            (7, -7, 0), (5, -7, 5), (0, -7, 7), (0, -7, -7), 
+            (0, 7, -7), (-5, 7, -5), (-7, 7, 0), (7, 7, 0), 
+            (7, -7, 0), (-7, -7, 0), (-7, 7, 0)
+            ), 
+        "foot": (
+            (-4, 0, -4), (-4, 0, -7), (-3, 0, -11), (-1, 0, -12), 
+            (0, 0, -12), (1, 0, -12), (3, 0, -11), (4, 0, -7), 
+            (4, 0, -4), (-4, 0, -4), (-5, 0, 1), (-5, 0, 6), 
+            (-4, 0, 12), (-2, 0, 15), (0, 0, 15.5), (2, 0, 15), 
+            (4, 0, 12), (5, 0, 6), (5, 0, 1), (4, 0, -4), (-4, 0, -4), 
+            (4, 0, -4)
+            ), 
+        "foot2": (
+            (-6, 12, -14), (-6, 12, 6), (6, 12, 6), (6, 12, -14), 
+            (-6, 12, -14), (-6, 0, -14), (-6, 0, 18), (6, 0, 18), 
+            (6, 0, -14), (-6, 0, -14), (-6, 0, 18), (-6, 12, 6), 
+            (6, 12, 6), (6, 0, 18), (6, 0, -14), (6, 12, -14)
+            ), 
+        "hat": (
+            (14, 9, 0), (0, 15, 0), (-14, 9, 0), (-7, -5, 0), 
+            (-16, -7, 0), (0, -7, 0), (16, -7, 0), (7, -5, 0), 
+            (14, 9, 0)
+            ), 
+        "head": (
+            (13, 15, -11), (0, 25, -15), (-13, 15, -11), (-14, 6, 0), 
+            (-13, 15, 11), (0, 25, 15), (13, 15, 11), (14, 6, 0), 
+            (13, 15, -11)
+            ), 
+        "hoof": (
+            (-6, 0, -5), (-6.5, 0, -1), (-6, 0, 3), (-5.2, 0, 5.5), 
+            (-3, 0, 7.5), (0, 0, 8.2), (3, 0, 7.5), (5.2, 0, 5.5), 
+            (6, 0, 3), (6.5, 0, -1), (6, 0, -5), (4, 0, -5), 
+            (4.5, 0, -1), (4, 0, 3), (3.5, 0, 4.5), (2, 0, 6), 
+            (0, 0, 6.5), (-2, 0, 6), (-3.5, 0, 4.5), (-4, 0, 3), 
+            (-4.5, 0, -1), (-4, 0, -5), (-6, 0, -5), (-5.5, 0, -6.5), 
+            (5.5, 0, -6.5), (4.5, 0, -10), (2.2, 0, -12.2), 
+            (0, 0, -12.2), (-2.2, 0, -12.2), (-4.5, 0, -10), 
+            (-5.5, 0, -6.5)
+            ), 
+        "hoof2": (
+            (6, 6, -12), (0, 8, -12), (-6, 6, -12), (-8, 3, -13), 
+            (-8, 0, -12), (-7, 0, -10), (-8, 0, -6), (-9, 0, -1), 
+            (-8, 0, 4), (-5, 0, 9), (0, 0, 10), (5, 0, 9), (8, 0, 4), 
+            (9, 0, -1), (8, 0, -6), (7, 0, -10), (8, 0, -12), 
+            (8, 3, -13), (6, 6, -12)
+            ), 
+        "pipe": (
+            (0, 7, 7), (0, -7, 7), (4.9, -7, 4.9), (7, -7, 0), 
+            (7, 7, 0), (4.9, 7, -4.9), (0, 7, -7), (0, -7, -7), 
+            (-4.9, -7, -4.9), (-7, -7, 0), (-7, 7, 0), (-4.9, 7, 4.9), 
+            (0, 7, 7), (4.9, 7, 4.9), (7, 7, 0), (7, -7, 0), 
+            (4.9, -7, -4.9), (0, -7, -7), (0, 7, -7), (-4.9, 7, -4.9), 
+            (-7, 7, 0), (-7, -7, 0), (-4.9, -7, 4.9), (0, -7, 7)
+            ), 
+        "pointer": (
+            (0, 8, 4), (-2.8, 8, 2.8), (-4, 8, 0), (-2.8, 8, -2.8), 
+            (0, 8, -4), (2.8, 8, -2.8), (4, 8, -0), (2.8, 8, 2.8), 
+            (0, 8, 4), (0, 8, -0), (0, 0, -0)
+            ), 
+        "scapula": (
+            (2, 10, -11), (0, 0, -11), (-2, 10, -11), (-3, 18, 0), 
+            (-2, 10, 11), (0, 0, 11), (2, 10, 11), (3, 18, 0), 
+            (2, 10, -11)
+            ), 
+        "sphere": (
+            (0, 5, 0), (0, 3.5, 3.5), (0, 0, 5), (0, -3.5, 3.5), 
+            (0, -5, 0), (0, -3.5, -3.5), (0, 0, -5), (0, 3.5, -3.5), 
+            (0, 5, 0), (-3.5, 3.5, 0), (-5, 0, 0), (-3.5, 0, 3.5), 
+            (0, 0, 5), (3.5, 0, 3.5), (5, 0, 0), (3.5, 0, -3.5), 
+            (0, 0, -5), (-3.5, 0, -3.5), (-5, 0, 0), (-3.5, -3.5, 0), 
+            (0, -5, 0), (3.5, -3.5, 0), (5, 0, 0), (3.5, 3.5, 0), 
+            (0, 5, 0)
+            ), 
+        "square": (
+            (25, 0, 25), (25, 0, -25), (-25, 0, -25), 
+            (-25, 0, 25), (25, 0, 25)
+            ),
+        }
+    _SHAPE_SET = frozenset(controllerShapes)
 
 
     def createControllers(self, **kwargs):
@@ -681,23 +858,23 @@ class Controllers:
         - "pipe", "pointer", 
         - "scapula", "sphere", "square", 
          """
-        allShp = self.controllerShapes.keys()
-        result = []
-        if kwargs.keys():
-            cuvToMake = [i for i in kwargs.keys() if i in allShp]
+        if kwargs:
+            cuvToMake = [i for i in kwargs if i in self._SHAPE_SET]
         else:
-            cuvToMake = allShp
-        for shpName in cuvToMake:
-            pos = self.controllerShapes[shpName]
-            try:
-                cuvName = kwargs[shpName]
-            except:
-                cuvName = shpName
-            if pm.objExists(cuvName):
-                continue
-            else:
-                cuv = pm.curve(p=pos, d=1, n=cuvName)
-                result.append(cuv)
+            cuvToMake = list(self.controllerShapes)
+        result = []
+        pm.undoInfo(openChunk=True)
+        try:
+            for shpName in cuvToMake:
+                pos = self.controllerShapes[shpName]
+                cuvName = kwargs.get(shpName, shpName)
+                if pm.objExists(cuvName):
+                    continue
+                else:
+                    cuv = pm.curve(p=pos, d=1, n=cuvName)
+                    result.append(cuv)
+        finally:
+            pm.undoInfo(closeChunk=True)
         return result
 
 
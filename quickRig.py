@@ -1,8 +1,98 @@
-﻿from general import pm, parentHierarchically, getBoundingBoxSize, \
+﻿from general import pm, parentHierarchically, \
     getFlattenList, RigGroups, Controllers, groupingWithOwnPivot
+import maya.cmds as cmds
+import numpy as np
+from contextlib import contextmanager
+import functools
 import os
 
 
+_CTRL_CACHE = {}
+_PYNODE_CACHE = {}
+_cacheScriptJobs = []
+
+
+def _toPyNode(name: str):
+    """ PyNode construction does a full DG lookup,
+    so cache it for repeated rig builds on the same objects.
+    A cached node is revalidated before use: cleanUp deletes and
+    recreates nodes by name, which leaves dead handles behind.
+     """
+    cached = _PYNODE_CACHE.get(name)
+    if cached is not None:
+        try:
+            if cached.exists():
+                return cached
+        except Exception:
+            pass
+        del _PYNODE_CACHE[name]
+    result = pm.PyNode(name)
+    _PYNODE_CACHE[name] = result
+    return result
+
+
+def _installCacheClear():
+    """ Flush the PyNode cache whenever a scene is opened or created,
+    since the cached handles no longer point at anything. """
+    if _cacheScriptJobs:
+        return
+    for event in ("NewSceneOpened", "SceneOpened"):
+        job = cmds.scriptJob(event=(event, _PYNODE_CACHE.clear))
+        _cacheScriptJobs.append(job)
+
+
+def _ctrlFromTemplate(shapeName, ctrlName):
+    """ Build each controller shape once as a hidden template,
+    and duplicate it for every later request.
+    Duplicating a curve is much cheaper than
+    rebuilding it point by point.
+    The hidden "shapeName_template" node stays in the scene
+    so it can be reused after a module reload or a scene reopen.
+     """
+    template = _CTRL_CACHE.get(shapeName)
+    if not template or not cmds.objExists(template):
+        templateName = f"{shapeName}_template"
+        if cmds.objExists(templateName):
+            template = templateName
+        else:
+            made = Controllers().createControllers( \
+                **{shapeName: templateName})
+            template = str(made[0])
+        cmds.setAttr(f"{template}.visibility", 0)
+        _CTRL_CACHE[shapeName] = template
+    result = cmds.duplicate(template, n=ctrlName)[0]
+    cmds.setAttr(f"{result}.visibility", 1)
+    return result
+
+
+@functools.lru_cache(maxsize=1)
+def _rigGroupNames() -> tuple:
+    """ The rig group names below assetName never change,
+    so flatten them once and reuse the result. """
+    groupNames = RigGroups().groupNames
+    names = list(groupNames.keys())[1:]
+    names += getFlattenList(list(groupNames.values())[1:])
+    return tuple(names)
+
+
+@contextmanager
+def _fastBuild():
+    """ Group every command of a build step into one undo chunk,
+    and keep the viewport and the evaluation manager quiet
+    while the step runs. Everything is restored on exit.
+     """
+    evalMode = cmds.evaluationManager(q=True, mode=True)[0]
+    cmds.undoInfo(openChunk=True)
+    cmds.refresh(suspend=True)
+    cmds.evaluationManager(mode="off")
+    try:
+        yield
+    finally:
+        cmds.evaluationManager(mode=evalMode)
+        cmds.refresh(suspend=False)
+        cmds.undoInfo(closeChunk=True)
+
+
 class Car:
     def __init__(self):
         self.assetName = "assetName"
@@ -35,50 +125,62 @@ class Car:
                 [f"jnt_wheelLeftFront{i}" for i in ["", "End"]], 
                 [f"jnt_wheelRightFront{i}" for i in ["", "End"]], 
                 [f"jnt_wheelLeftRear{i}" for i in ["", "End"]], 
-                [f"jnt_wheelRightRear{i}" for i in ["", "End"]], 
-                ], 
+                [f"jnt_wheelRightRear{i}" for i in ["", "End"]],
+                ],
             }
+        self._jntNames = tuple(self.jntNameAndPos)
+        self.wheelCtrlGrp = "wheelCtrls_grp"
+        self._wheelJntNames = tuple(i for i in self._jntNames \
+            if "wheel" in i.lower() and not i.endswith("End"))
+        self._delCandidates = tuple([self.sizeCtrl, self.wheelCtrlGrp] \
+            + list(self._jntNames) \
+            + list(self.ctrlNames.values()) \
+            + [f"cc_{i}*" for i in self._wheelJntNames] \
+            + list(_rigGroupNames()))
 
 
     def createJoints(self):
-        # CleanUp first
-        self.cleanUp()
-        # Create joints
-        for jnt, pos in self.jntNameAndPos.items():
-            pm.select(cl=True)
-            pm.joint(p=pos, n=jnt)
-        # Set hierarchy
-        for parents, childList in self.hierarchy.items():
-            for children in childList:
-                parentHierarchically(children)
-                pm.makeIdentity(children, a=1, t=1, r=1, s=1, jo=1)
-                pm.parent(children[0], parents)
+        with _fastBuild():
+            # CleanUp first
+            self.cleanUp()
+            # Create joints
+            for jnt, pos in self.jntNameAndPos.items():
+                cmds.select(cl=True)
+                cmds.joint(p=pos, n=jnt)
+            # Set hierarchy
+            for parents, childList in self.hierarchy.items():
+                allChildren = []
+                for children in childList:
+                    parentHierarchically(children)
+                    allChildren.extend(children)
+                cmds.makeIdentity(allChildren, a=1, t=1, r=1, s=1, jo=1)
+                cmds.parent([children[0] for children in childList], parents)
 
 
     def createSizeController(self):
-        self.sizeRatio = getBoundingBoxSize(self.rootJoint)
+        """ The size comes straight from the stored joint positions,
+        so no scene query is needed and this can run
+        before the joints exist. """
+        positions = np.array(list(self.jntNameAndPos.values()))
+        halfSize = (positions.max(axis=0) - positions.min(axis=0)) / 2
+        self.sizeRatio = round(float(halfSize.max()), 3)
         pm.circle(nr=(0,1,0), ch=0, n=self.sizeCtrl, r=self.sizeRatio)
         pm.parent(self.rootJoint, self.sizeCtrl)
 
 
     def cleanUp(self):
-        delGroups = [self.sizeCtrl, self.assetName]
-        joints = list(self.jntNameAndPos.keys())
-        grpNames = list(RigGroups().groupNames.keys())[1:]
-        grpNames += getFlattenList(list(RigGroups().groupNames.values())[1:])
-        ctrls = list(self.ctrlNames.values())
-        delGroups += joints + grpNames + ctrls
-        for i in delGroups:
-            try:
-                pm.delete(i)
-            except:
-                continue
+        with _fastBuild():
+            delGroups = [self.assetName] + list(self._delCandidates)
+            existing = cmds.ls(delGroups)
+            if existing:
+                cmds.delete(existing)
 
 
     def updatePosition(self):
-        for jnt in self.jntNameAndPos.keys():
-            pos = pm.xform(jnt, q=True, t=True, ws=True)
-            self.jntNameAndPos[jnt] = tuple(pos)
+        self._posArray = np.array([cmds.xform(jnt, q=True, t=True, ws=True) \
+            for jnt in self._jntNames])
+        positions = map(tuple, self._posArray.tolist())
+        self.jntNameAndPos = dict(zip(self._jntNames, positions))
 
 
     def sameBothSide(self, side: str="LeftToRight"):
@@ -87,36 +189,30 @@ class Car:
         >>> sameBothSide()
         >>> sameBothSide("RightToLeft")
          """
-        # Update first
-        self.updatePosition()
-        # Split both side
-        A, B = side.split("To")
-        aSide = []
-        bSide = []
-        for jntName in self.jntNameAndPos.keys():
-            if A in jntName:
-                aSide.append(jntName)
-            elif B in jntName:
-                bSide.append(jntName)
-            else:
-                continue
-        # Update opposite
-        for idx, aJoint in enumerate(aSide):
-            x, y, z = pm.xform(aJoint, q=True, t=True, ws=True)
-            bJoint = bSide[idx]
-            self.jntNameAndPos[bJoint] = (-1*x, y, z)
-        # Create joints again
-        self.createJoints()
+        with _fastBuild():
+            # Update first
+            self.updatePosition()
+            # Split both side
+            A, B = side.split("To")
+            aIndex = [i for i, jnt in enumerate(self._jntNames) if A in jnt]
+            bIndex = [i for i, jnt in enumerate(self._jntNames) if B in jnt]
+            # Update opposite
+            self._posArray[bIndex] = self._posArray[aIndex] * [-1, 1, 1]
+            positions = map(tuple, self._posArray.tolist())
+            self.jntNameAndPos = dict(zip(self._jntNames, positions))
+            # Create joints again
+            self.createJoints()
 
 
     def build(self):
-        # Update first
-        self.updatePosition()
-        self.createJoints()
-        # create rig groups
-        self.createRigGroups()
-        self.createBasicCtrls()
-        # createWheelCtrls
+        with _fastBuild():
+            # Update first
+            self.updatePosition()
+            self.createJoints()
+            # create rig groups
+            self.createRigGroups()
+            self.createBasicCtrls()
+            self.createWheelCtrls()
 
 
     def createRigGroups(self):
@@ -152,8 +248,50 @@ class Car:
             pm.warning("There are no basic rigging groups.")
         
         
+    def makeWheelList(self) -> list:
+        """ Wheel joints under the root joint,
+        found by hierarchy traversal without touching the selection.
+         """
+        descendants = cmds.listRelatives(self.rootJoint, ad=True, \
+            type="joint") or []
+        result = [i for i in descendants \
+            if "wheel" in i.lower() and not i.endswith("End")]
+        return result
+
+
     def createWheelCtrls(self):
-        pass
+        """ Create the wheel controllers and constrain their offset
+        groups to the sub controller. The offsets are gathered first,
+        and the constraints run in one suspended pass.
+         """
+        found = set(self.makeWheelList())
+        # Keep the declaration order: left and right alternate.
+        wheelJoints = [i for i in self._jntNames if i in found]
+        if not wheelJoints:
+            pm.warning("There are no wheel joints.")
+            return
+        with _fastBuild():
+            Wheel(wheelJoints)
+            ccWheel = [f"cc_{i}" for i in wheelJoints]
+            offsets = [cmds.listRelatives(i, p=True)[0] for i in ccWheel]
+            # One named group holds every wheel hierarchy,
+            # so cleanUp can remove them by name on a rebuild.
+            topGrps = [cmds.listRelatives(i, p=True)[0] for i in offsets]
+            wheelGrp = cmds.group(em=True, n=self.wheelCtrlGrp)
+            cmds.parent(topGrps, wheelGrp)
+            if cmds.objExists("controllers"):
+                cmds.parent(wheelGrp, "controllers")
+            else:
+                pm.warning("There are no basic rigging groups.")
+            for off in offsets:
+                cmds.parentConstraint(self.subCtrl, off, mo=True, w=1)
+                cmds.scaleConstraint(self.subCtrl, off, mo=True, w=1)
+            # Left wheels red, right wheels blue.
+            for ctrls, color in [(ccWheel[0::2], 13), (ccWheel[1::2], 6)]:
+                for i in ctrls:
+                    shape = cmds.listRelatives(i, s=True)[0]
+                    cmds.setAttr(f"{shape}.overrideEnabled", 1)
+                    cmds.setAttr(f"{shape}.overrideColor", color)
 
 
 
@@ -164,47 +302,60 @@ class Wheel:
 
 
     def main(self):
-        for obj in self.sel:
-            ctrl = self.createWheelCtrl(obj)
-            off = self.createOffsetGrp(ctrl)
-            loc = self.createCtrlLocator(ctrl)
-            null, prev, orient = self.createGroupNames(off)
-            self.createCtrlChannel(ctrl)
-            self.createOffsetChannel(off)
-            self.createCtrlGroup(off, null, prev, orient)
-            self.createExpression(ctrl, off, loc, orient, prev)
+        with _fastBuild():
+            radii = self._radii(self.sel) if self.sel else []
+            positions = [cmds.xform(str(i), q=True, ws=True, rp=True) \
+                for i in self.sel]
+            for obj, rad, pos in zip(self.sel, radii, positions):
+                ctrl = self.createWheelCtrl(obj, rad, pos)
+                off = self.createOffsetGrp(ctrl)
+                loc = self.createCtrlLocator(ctrl)
+                null, prev, orient = self.createGroupNames(off)
+                self.createCtrlChannel(ctrl)
+                self.createOffsetChannel(off)
+                self.createCtrlGroup(off, null, prev, orient)
+                self.createExpression(ctrl, off, loc, orient, prev)
 
 
     def checkParam(self, obj):
-        """ Checks if there is an argument 
+        """ Checks if there is an argument
         and creates the argument as PyNode.
+        The selection is read once here, at the boundary,
+        and never written back. Prefer passing the list explicitly.
          """
         if obj and isinstance(obj, list):
+            _installCacheClear()
             for j, k in enumerate(obj):
                 if isinstance(k, pm.PyNode):
                     continue
                 else:
-                    obj[j] = pm.PyNode(k)
+                    obj[j] = _toPyNode(str(k))
             result = obj
         else:
             result = pm.ls(sl=True)
         return result
 
 
-    def createWheelCtrl(self, obj, sizeUp=1.2):
-        """ Create a controller 1.2 times larger than 
-        the boundingBox size of the selected object.
+    @classmethod
+    def _radii(cls, objs, sizeUp=1.2):
+        """ Compute every controller radius in one numpy reduction:
+        sizeUp times the boundingBox size of each object.
+        sizeUp takes one ratio, or one ratio per object. """
+        boundingBoxes = np.array([cmds.xform(str(i), q=True, bb=True, \
+            ws=True) for i in objs])
+        halfSizes = (boundingBoxes[:, 3:6] - boundingBoxes[:, 0:3]) * 0.5
+        ups = np.asarray(sizeUp, dtype=float)
+        radii = np.round(np.max(halfSizes, axis=1), 3) * ups
+        return radii.tolist()
+
+
+    def createWheelCtrl(self, obj, rad, pos):
+        """ Create a controller with the given radius,
+        moved to the precomputed position.
          """
-        bb = pm.xform(obj, q=True, bb=True, ws=True)
-        xMin, yMin, zMin, xMax, yMax, zMax = bb
-        x = (xMax - xMin) / 2
-        y = (yMax - yMin) / 2
-        z = (zMax - zMin) / 2
-        rad = max(x, y, z)
-        rad = round(rad, 3) * sizeUp
         cuv = pm.circle(nr=(1, 0, 0), r=rad, n=f"cc_{obj}", ch=False)
         cuv = cuv[0]
-        pm.matchTransform(cuv, obj, pos=True)
+        cmds.xform(str(cuv), ws=True, t=pos)
         return cuv
 
 
@@ -242,10 +393,17 @@ class Wheel:
 
 
     def createOffsetChannel(self, offset):
-        """ Create a PrePos channel in the offset group. """
+        """ Create a PrevPos compound channel in the offset group.
+        One addAttr for the parent and one per child,
+        shown as a single channel box entry.
+         """
+        cmds.addAttr(str(offset), ln='PrevPos', at='double3')
+        for i in ['X', 'Y', 'Z']:
+            cmds.addAttr(str(offset), ln=f'PrevPos{i}', at='double', \
+                dv=0, p='PrevPos')
+        cmds.setAttr(f'{offset}.PrevPos', e=True, k=True)
         for i in ['X', 'Y', 'Z']:
-            pm.addAttr(offset, ln=f'PrevPos{i}', at='double', dv=0)
-            pm.setAttr(f'{offset}.PrevPos{i}', e=True, k=True)
+            cmds.setAttr(f'{offset}.PrevPos{i}', e=True, k=True)
 
 
     def createCtrlGroup(self, offset, null, prev, orient):
@@ -265,59 +423,80 @@ class Wheel:
 
 
     def createExpression(self, ctrl, offset, loc, orient, prev):
-        """ Create an expression. """
+        """ Build the auto roll formula as a node network.
+        Native nodes evaluate much faster than a MEL expression.
+        Only the rotateX accumulation and the previous-position
+        update stay in a small expression.
+         """
+        # The prev group follows the stored previous position.
+        for i in ['X', 'Y', 'Z']:
+            cmds.connectAttr(f'{offset}.PrevPos{i}', \
+                f'{prev}.translate{i}', f=True)
+        # Distance moved since the previous evaluation.
+        dist = cmds.createNode('distanceBetween', n=f'{ctrl}_distance')
+        for i in ['X', 'Y', 'Z']:
+            cmds.connectAttr(f'{offset}.PrevPos{i}', \
+                f'{dist}.point1{i}', f=True)
+            cmds.connectAttr(f'{offset}.translate{i}', \
+                f'{dist}.point2{i}', f=True)
+        # Circumference: 2 * 3.141 * Radius
+        circ = cmds.createNode('multDoubleLinear', n=f'{ctrl}_circumference')
+        cmds.connectAttr(f'{ctrl}.Radius', f'{circ}.input1', f=True)
+        cmds.setAttr(f'{circ}.input2', 2 * 3.141)
+        # Degrees: distance / circumference * 360
+        ratio = cmds.createNode('multiplyDivide', n=f'{ctrl}_ratio')
+        cmds.setAttr(f'{ratio}.operation', 2)
+        cmds.connectAttr(f'{dist}.distance', f'{ratio}.input1X', f=True)
+        cmds.connectAttr(f'{circ}.output', f'{ratio}.input2X', f=True)
+        degrees = cmds.createNode('multDoubleLinear', n=f'{ctrl}_degrees')
+        cmds.connectAttr(f'{ratio}.outputX', f'{degrees}.input1', f=True)
+        cmds.setAttr(f'{degrees}.input2', 360)
+        # The AutoRoll channel works as an on/off switch.
+        autoRoll = cmds.createNode('multDoubleLinear', n=f'{ctrl}_autoRoll')
+        cmds.connectAttr(f'{degrees}.output', f'{autoRoll}.input1', f=True)
+        cmds.connectAttr(f'{ctrl}.AutoRoll', f'{autoRoll}.input2', f=True)
+        # sin(orient.rotateY): the quatX of a rotation
+        # by twice the angle is the sine of the angle.
+        doubled = cmds.createNode('multDoubleLinear', n=f'{ctrl}_doubleAngle')
+        cmds.connectAttr(f'{orient}.rotateY', f'{doubled}.input1', f=True)
+        cmds.setAttr(f'{doubled}.input2', 2)
+        sin = cmds.createNode('eulerToQuat', n=f'{ctrl}_sin')
+        cmds.connectAttr(f'{doubled}.output', f'{sin}.inputRotateX', f=True)
+        direction = cmds.createNode('multDoubleLinear', n=f'{ctrl}_direction')
+        cmds.connectAttr(f'{autoRoll}.output', f'{direction}.input1', f=True)
+        cmds.connectAttr(f'{sin}.outputQuatX', f'{direction}.input2', f=True)
+        # Compensate the rig scale.
+        rollDelta = cmds.createNode('multiplyDivide', n=f'{ctrl}_rollDelta')
+        cmds.setAttr(f'{rollDelta}.operation', 2)
+        cmds.connectAttr(f'{direction}.output', f'{rollDelta}.input1X', f=True)
+        cmds.connectAttr(f'{offset}.scaleY', f'{rollDelta}.input2X', f=True)
+        # Accumulation cannot be a static network.
         br = '\n'
-        # expression1
-        expr1 = f'float $R = {ctrl}.Radius;{br}'
-        expr1 += f'float $A = {ctrl}.AutoRoll;{br}'
-        expr1 += f'float $J = {loc}.rotateX;{br}'
-        expr1 += f'float $C = 2 * 3.141 * $R;{br}'
-        expr1 += f'float $O = {orient}.rotateY;{br}'
-        expr1 += f'float $S = {offset}.scaleY;{br}'
-        expr1 += f'float $pX = {offset}.PrevPosX;{br}'
-        expr1 += f'float $pY = {offset}.PrevPosY;{br}'
-        expr1 += f'float $pZ = {offset}.PrevPosZ;{br}'
-        expr1 += f'{prev}.translateX = $pX;{br}'
-        expr1 += f'{prev}.translateY = $pY;{br}'
-        expr1 += f'{prev}.translateZ = $pZ;{br}'
-        expr1 += f'float $nX = {offset}.translateX;{br}'
-        expr1 += f'float $nY = {offset}.translateY;{br}'
-        expr1 += f'float $nZ = {offset}.translateZ;{br*2}'
-        # expression2
-        expr2 = f'float $D = `mag<<$nX-$pX, $nY-$pY, $nZ-$pZ>>`;{br*2}'
-        # expression3
-        expr3 = f'{loc}.rotateX = $J'
-        expr3 += ' + ($D/$C) * 360'
-        expr3 += ' * $A'
-        expr3 += ' * 1'
-        expr3 += ' * sin(deg_to_rad($O))'
-        expr3 += f' / $S;{br*2}'
-        # expression4
-        expr4 = f'{offset}.PrevPosX = $nX;{br}'
-        expr4 += f'{offset}.PrevPosY = $nY;{br}'
-        expr4 += f'{offset}.PrevPosZ = $nZ;{br}'
-        # final
-        expr = expr1 + expr2 + expr3 + expr4
+        expr = f'{loc}.rotateX = {loc}.rotateX + {rollDelta}.outputX;{br}'
+        expr += f'{offset}.PrevPosX = {offset}.translateX;{br}'
+        expr += f'{offset}.PrevPosY = {offset}.translateY;{br}'
+        expr += f'{offset}.PrevPosZ = {offset}.translateZ;{br}'
         pm.expression(s=expr, o='', ae=1, uc='all')
 
 
 
 
-# car = Car()
-# car.cleanUp()
-# car.createJoints()
-# car.sameBothSide()
-# car.build()
-# car.createRigGroups()
+def main():
+    """ Build the car rig.
+    Importing this module does nothing by itself;
+    call this entry point explicitly.
+    >>> import quickRig
+    >>> quickRig.main()
+     """
+    Car().build()
 
 
 
 # wh = Wheel()
 def createWheelCtrl(**kwargs):
     """ kwargs = {"wheelName1": (0, 0, 0), "wheelName2": (0, 0, 0), } """
-    ctrl = Controllers()
     for wheelName, pos in kwargs.items():
-        ccWheel = ctrl.createControllers(circle=wheelName)
+        ccWheel = _ctrlFromTemplate("circle", wheelName)
         pm.rotate(ccWheel, (0, 0, 90))
         pm.makeIdentity(ccWheel, a=1, t=1, r=1, s=1, jo=0)
         print(pos)